@@ -1,296 +1,385 @@
 #!/usr/bin/env python3
 """Apply cleaning operations to CSV file."""
 import pandas as pd
+import numpy as np
+import functools
 import json
 import sys
-import chardet
 import re
+import warnings
 from pathlib import Path
 from datetime import datetime
+from analyze import detect_encoding
 
+# RFC 5322 simplified pattern
+EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+SPECIAL_RE = re.compile(r'[^\w\s]')
+DIGITS_RE = re.compile(r'\d')
+WHITESPACE_RE = re.compile(r'\s+')
 
-def detect_encoding(path: str) -> str:
-    """Detect file encoding using chardet."""
-    with open(path, 'rb') as f:
-        return chardet.detect(f.read(100000))['encoding'] or 'utf-8'
 
+def _present_strings(series: pd.Series) -> pd.Series:
+    """Non-null, non-blank values as strings, keeping the original index."""
+    text = series.astype(str)
+    return text[series.notna() & (text.str.strip() != '')]
 
-def apply_operation(df: pd.DataFrame, op: dict) -> tuple[pd.DataFrame, dict]:
-    """Apply single operation, return modified df and change log."""
-    op_type = op["type"]
-    log = {"operation": op_type, "column": op.get("column"), "timestamp": datetime.now().isoformat()}
-
-    if op_type == "fill_missing":
-        col = op["column"]
-        strategy = op["strategy"]
-        count = int(df[col].isna().sum())
 
-        if count == 0:
-            log["filled"] = 0
-            log["note"] = "No missing values to fill"
-            return df, log
-
-        if strategy == "mean":
-            fill_val = df[col].mean()
-            df[col] = df[col].fillna(fill_val)
-            log["fill_value"] = round(float(fill_val), 4)
-        elif strategy == "median":
-            fill_val = df[col].median()
-            df[col] = df[col].fillna(fill_val)
-            log["fill_value"] = float(fill_val)
-        elif strategy == "mode":
-            mode_val = df[col].mode()
-            if len(mode_val) > 0:
-                fill_val = mode_val[0]
-                df[col] = df[col].fillna(fill_val)
-                log["fill_value"] = str(fill_val)
-            else:
-                log["error"] = "No mode found"
-                return df, log
-        elif strategy == "constant":
-            fill_val = op.get("value", "")
-            df[col] = df[col].fillna(fill_val)
+@functools.lru_cache(maxsize=65536)
+def _normalize_phone(value: str, country: str):
+    """Format phone number as E.164, or None if invalid."""
+    import phonenumbers
+    try:
+        parsed = phonenumbers.parse(value, country)
+        if phonenumbers.is_valid_number(parsed):
+            return phonenumbers.format_number(parsed, phonenumbers.PhoneNumberFormat.E164)
+    except:
+        pass
+    return None
+
+
+def apply_string_ops(series: pd.Series, ops: list) -> tuple[pd.Series, list]:
+    """Apply string normalization ops in order, return result and ops applied."""
+    applied = []
+    for string_op in ops:
+        if string_op == "trim":
+            series = series.str.strip()
+            applied.append("trim")
+        elif string_op == "lowercase":
+            series = series.str.lower()
+            applied.append("lowercase")
+        elif string_op == "uppercase":
+            series = series.str.upper()
+            applied.append("uppercase")
+        elif string_op == "titlecase":
+            series = series.str.title()
+            applied.append("titlecase")
+        elif string_op == "remove_special":
+            series = series.str.replace(SPECIAL_RE, '', regex=True)
+            applied.append("remove_special")
+        elif string_op == "remove_digits":
+            series = series.str.replace(DIGITS_RE, '', regex=True)
+            applied.append("remove_digits")
+        elif string_op == "collapse_whitespace":
+            series = series.str.replace(WHITESPACE_RE, ' ', regex=True)
+            applied.append("collapse_whitespace")
+
+    return series, applied
+
+
+def _op_fill_missing(df: pd.DataFrame, op: dict, log: dict) -> tuple[pd.DataFrame, dict]:
+    """Fill missing values in a column using the given strategy."""
+    col = op["column"]
+    strategy = op["strategy"]
+    # One null mask serves both the count and the fill
+    missing = df[col].isna()
+    count = int(missing.sum())
+
+    if count == 0:
+        log["filled"] = 0
+        log["note"] = "No missing values to fill"
+        return df, log
+
+    if strategy == "mean":
+        fill_val = df[col].mean()
+        df[col] = df[col].mask(missing, fill_val)
+        log["fill_value"] = round(float(fill_val), 4)
+    elif strategy == "median":
+        fill_val = df[col].median()
+        df[col] = df[col].mask(missing, fill_val)
+        log["fill_value"] = float(fill_val)
+    elif strategy == "mode":
+        mode_val = df[col].mode()
+        if len(mode_val) > 0:
+            fill_val = mode_val[0]
+            df[col] = df[col].mask(missing, fill_val)
             log["fill_value"] = str(fill_val)
-        elif strategy == "forward":
-            df[col] = df[col].ffill()
-            log["method"] = "forward_fill"
-        elif strategy == "backward":
-            df[col] = df[col].bfill()
-            log["method"] = "backward_fill"
         else:
-            log["error"] = f"Unknown strategy: {strategy}"
+            log["error"] = "No mode found"
             return df, log
+    elif strategy == "constant":
+        fill_val = op.get("value", "")
+        df[col] = df[col].mask(missing, fill_val)
+        log["fill_value"] = str(fill_val)
+    elif strategy == "forward":
+        df[col] = df[col].ffill()
+        log["method"] = "forward_fill"
+    elif strategy == "backward":
+        df[col] = df[col].bfill()
+        log["method"] = "backward_fill"
+    else:
+        log["error"] = f"Unknown strategy: {strategy}"
+        return df, log
 
-        log["filled"] = count
+    log["filled"] = count
 
-    elif op_type == "drop_missing":
-        cols = op.get("columns")
-        how = op.get("how", "any")
-        before = len(df)
-        df = df.dropna(subset=cols, how=how)
-        dropped = before - len(df)
-        log["dropped"] = dropped
-        log["remaining"] = len(df)
+    return df, log
 
-    elif op_type == "remove_duplicates":
-        cols = op.get("columns")
-        keep = op.get("keep", "first")
-        before = len(df)
 
-        if keep == "none":
-            df = df.drop_duplicates(subset=cols, keep=False)
-        else:
-            df = df.drop_duplicates(subset=cols, keep=keep)
-
-        removed = before - len(df)
-        log["removed"] = removed
-        log["remaining"] = len(df)
-
-    elif op_type == "normalize_strings":
-        col = op["column"]
-        ops = op.get("ops", ["trim"])
-        series = df[col].astype(str)
-        applied = []
-
-        for string_op in ops:
-            if string_op == "trim":
-                series = series.str.strip()
-                applied.append("trim")
-            elif string_op == "lowercase":
-                series = series.str.lower()
-                applied.append("lowercase")
-            elif string_op == "uppercase":
-                series = series.str.upper()
-                applied.append("uppercase")
-            elif string_op == "titlecase":
-                series = series.str.title()
-                applied.append("titlecase")
-            elif string_op == "remove_special":
-                series = series.str.replace(r'[^\w\s]', '', regex=True)
-                applied.append("remove_special")
-            elif string_op == "remove_digits":
-                series = series.str.replace(r'\d', '', regex=True)
-                applied.append("remove_digits")
-            elif string_op == "collapse_whitespace":
-                series = series.str.replace(r'\s+', ' ', regex=True)
-                applied.append("collapse_whitespace")
-
-        # Handle 'nan' strings that resulted from NaN values
-        series = series.replace('nan', '')
-
-        df[col] = series
-        log["applied"] = applied
-        log["rows_affected"] = len(df)
-
-    elif op_type == "standardize_dates":
-        from dateutil import parser as date_parser
-
-        col = op["column"]
-        fmt = op.get("format", "%Y-%m-%d")
-        dayfirst = op.get("dayfirst", False)
-        yearfirst = op.get("yearfirst", False)
-
-        def parse_date(x):
-            if pd.isna(x) or str(x).strip() == '':
-                return None
-            try:
-                parsed = date_parser.parse(str(x), dayfirst=dayfirst, yearfirst=yearfirst)
-                return parsed.strftime(fmt)
-            except:
-                return None
-
-        before_nulls = df[col].isna().sum()
-        df[col] = df[col].apply(parse_date)
-        after_nulls = df[col].isna().sum()
-
-        log["converted"] = int(len(df) - after_nulls)
-        log["failed"] = int(after_nulls - before_nulls)
-        log["format"] = fmt
-
-    elif op_type == "normalize_phones":
-        try:
-            import phonenumbers
-        except ImportError:
-            log["error"] = "phonenumbers library not installed"
-            return df, log
+def _op_drop_missing(df: pd.DataFrame, op: dict, log: dict) -> tuple[pd.DataFrame, dict]:
+    """Drop rows with missing values in the given columns."""
+    cols = op.get("columns")
+    if isinstance(cols, str):
+        cols = [cols]
+    how = op.get("how", "any")
+    null_mask = (df if cols is None else df[cols]).isna()
+    missing = null_mask.all(axis=1) if how == "all" else null_mask.any(axis=1)
+    df = df.loc[~missing]
+    log["dropped"] = int(missing.sum())
+    log["remaining"] = len(df)
 
-        col = op["column"]
-        country = op.get("country", "US")
-
-        def normalize_phone(x):
-            if pd.isna(x) or str(x).strip() == '':
-                return None
-            try:
-                parsed = phonenumbers.parse(str(x), country)
-                if phonenumbers.is_valid_number(parsed):
-                    return phonenumbers.format_number(
-                        parsed, phonenumbers.PhoneNumberFormat.E164
-                    )
-            except:
-                pass
-            return None
+    return df, log
 
-        before = df[col].notna().sum()
-        df[col] = df[col].apply(normalize_phone)
-        after = df[col].notna().sum()
-
-        log["valid"] = int(after)
-        log["invalid"] = int(before - after)
-        log["country"] = country
-
-    elif op_type == "validate_emails":
-        col = op["column"]
-        # RFC 5322 simplified pattern
-        email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-
-        def validate_email(x):
-            if pd.isna(x) or str(x).strip() == '':
-                return None
-            email = str(x).strip().lower()
-            if re.match(email_pattern, email):
-                return email
-            return None
 
-        before = df[col].notna().sum()
-        df[col] = df[col].apply(validate_email)
-        after = df[col].notna().sum()
+def _op_remove_duplicates(df: pd.DataFrame, op: dict, log: dict) -> tuple[pd.DataFrame, dict]:
+    """Remove duplicate rows."""
+    cols = op.get("columns")
+    keep = op.get("keep", "first")
+    before = len(df)
 
-        log["valid"] = int(after)
-        log["invalid"] = int(before - after)
+    if keep == "none":
+        df = df.drop_duplicates(subset=cols, keep=False)
+    else:
+        df = df.drop_duplicates(subset=cols, keep=keep)
 
-    elif op_type == "cap_outliers":
-        col = op["column"]
-        method = op.get("method", "iqr")
-        multiplier = op.get("multiplier", 1.5)
-        series = df[col]
+    removed = before - len(df)
+    log["removed"] = removed
+    log["remaining"] = len(df)
 
-        if not pd.api.types.is_numeric_dtype(series):
-            log["error"] = f"Column {col} is not numeric"
-            return df, log
+    return df, log
 
-        clean = series.dropna()
-
-        if method == "iqr":
-            q1, q3 = clean.quantile([0.25, 0.75])
-            iqr = q3 - q1
-            lower = q1 - multiplier * iqr
-            upper = q3 + multiplier * iqr
-        elif method == "zscore":
-            mean = clean.mean()
-            std = clean.std()
-            lower = mean - multiplier * std
-            upper = mean + multiplier * std
-        elif method == "percentile":
-            lower_pct = op.get("lower_percentile", 1)
-            upper_pct = op.get("upper_percentile", 99)
-            lower = clean.quantile(lower_pct / 100)
-            upper = clean.quantile(upper_pct / 100)
-        else:
-            log["error"] = f"Unknown method: {method}"
-            return df, log
 
-        capped_low = int((series < lower).sum())
-        capped_high = int((series > upper).sum())
-        df[col] = series.clip(lower, upper)
+def _op_normalize_strings(df: pd.DataFrame, op: dict, log: dict) -> tuple[pd.DataFrame, dict]:
+    """Apply string normalization ops to a column."""
+    col = op["column"]
+    ops = op.get("ops", ["trim"])
+    series = df[col].astype(str)
+    uniques = series.unique()
+
+    if len(uniques) <= len(series) / 2:
+        # Low cardinality: transform each distinct value once, then map back
+        transformed, applied = apply_string_ops(pd.Series(uniques), ops)
+        series = series.map(pd.Series(transformed.to_numpy(), index=uniques))
+    else:
+        series, applied = apply_string_ops(series, ops)
+
+    # Handle 'nan' strings that resulted from NaN values
+    series = series.replace('nan', '')
+
+    df[col] = series
+    log["applied"] = applied
+    log["rows_affected"] = len(df)
+
+    return df, log
 
-        log["capped_low"] = capped_low
-        log["capped_high"] = capped_high
-        log["bounds"] = {"lower": round(float(lower), 4), "upper": round(float(upper), 4)}
-        log["method"] = method
 
-    elif op_type == "convert_type":
-        col = op["column"]
-        target_type = op["target_type"]
+def _op_standardize_dates(df: pd.DataFrame, op: dict, log: dict) -> tuple[pd.DataFrame, dict]:
+    """Parse dates in a column and reformat them."""
+    from dateutil import parser as date_parser
 
+    col = op["column"]
+    fmt = op.get("format", "%Y-%m-%d")
+    dayfirst = op.get("dayfirst", False)
+    yearfirst = op.get("yearfirst", False)
+
+    def parse_date(x):
         try:
-            if target_type == "int":
-                df[col] = pd.to_numeric(df[col], errors='coerce').astype('Int64')
-            elif target_type == "float":
-                df[col] = pd.to_numeric(df[col], errors='coerce')
-            elif target_type == "string":
-                df[col] = df[col].astype(str).replace('nan', '')
-            elif target_type == "datetime":
-                df[col] = pd.to_datetime(df[col], errors='coerce')
-            elif target_type == "category":
-                df[col] = df[col].astype('category')
-            elif target_type == "boolean":
-                # Map common boolean representations
-                bool_map = {
-                    'true': True, 'false': False,
-                    'yes': True, 'no': False,
-                    '1': True, '0': False,
-                    't': True, 'f': False,
-                    'y': True, 'n': False,
-                }
-                df[col] = df[col].astype(str).str.lower().map(bool_map)
-
-            log["converted_to"] = target_type
-            log["success"] = True
-        except Exception as e:
-            log["error"] = str(e)
-            log["success"] = False
-
-    elif op_type == "rename_column":
-        old_name = op["old_name"]
-        new_name = op["new_name"]
-        if old_name in df.columns:
-            df = df.rename(columns={old_name: new_name})
-            log["renamed"] = {old_name: new_name}
-        else:
-            log["error"] = f"Column {old_name} not found"
+            parsed = date_parser.parse(x, dayfirst=dayfirst, yearfirst=yearfirst)
+            return parsed.strftime(fmt)
+        except:
+            return None
+
+    before_nulls = df[col].isna().sum()
+    text = _present_strings(df[col])
+
+    # Vectorized parse first; dateutil only for rows pandas couldn't parse
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", UserWarning)
+            parsed = pd.to_datetime(text, errors='coerce', dayfirst=dayfirst, yearfirst=yearfirst)
+        formatted = parsed.dt.strftime(fmt).astype(object)
+    except (ValueError, TypeError):
+        formatted = pd.Series(None, index=text.index, dtype=object)
+    failed = formatted.isna()
+    formatted[failed] = text[failed].map(parse_date)
+    df[col] = formatted.reindex(df.index)
+    after_nulls = df[col].isna().sum()
+
+    log["converted"] = int(len(df) - after_nulls)
+    log["failed"] = int(after_nulls - before_nulls)
+    log["format"] = fmt
+
+    return df, log
+
+
+def _op_normalize_phones(df: pd.DataFrame, op: dict, log: dict) -> tuple[pd.DataFrame, dict]:
+    """Normalize phone numbers to E.164, invalid ones become null."""
+    try:
+        import phonenumbers
+    except ImportError:
+        log["error"] = "phonenumbers library not installed"
+        return df, log
+
+    col = op["column"]
+    country = op.get("country", "US")
+    before = df[col].notna().sum()
+    text = _present_strings(df[col])
+    # Parse each distinct number once; real columns repeat values a lot
+    mapping = {v: _normalize_phone(v, country) for v in text.unique()}
+    df[col] = text.map(mapping).reindex(df.index)
+    after = df[col].notna().sum()
+
+    log["valid"] = int(after)
+    log["invalid"] = int(before - after)
+    log["country"] = country
+
+    return df, log
+
+
+def _op_validate_emails(df: pd.DataFrame, op: dict, log: dict) -> tuple[pd.DataFrame, dict]:
+    """Lowercase and validate emails, invalid ones become null."""
+    col = op["column"]
+    before = df[col].notna().sum()
+    emails = df[col].astype(str).str.strip().str.lower()
+    valid = df[col].notna() & emails.str.match(EMAIL_RE, na=False)
+    df[col] = emails.where(valid, None)
+    after = df[col].notna().sum()
 
-    elif op_type == "drop_column":
-        cols = op["columns"] if isinstance(op.get("columns"), list) else [op["column"]]
-        existing = [c for c in cols if c in df.columns]
-        df = df.drop(columns=existing)
-        log["dropped_columns"] = existing
+    log["valid"] = int(after)
+    log["invalid"] = int(before - after)
 
+    return df, log
+
+
+def _op_cap_outliers(df: pd.DataFrame, op: dict, log: dict) -> tuple[pd.DataFrame, dict]:
+    """Clip numeric outliers to IQR, z-score or percentile bounds."""
+    col = op["column"]
+    method = op.get("method", "iqr")
+    multiplier = op.get("multiplier", 1.5)
+    series = df[col]
+
+    if not pd.api.types.is_numeric_dtype(series):
+        log["error"] = f"Column {col} is not numeric"
+        return df, log
+
+    # Work on the raw buffer: nan-aware NumPy reductions skip the dropna() copy
+    values = series.to_numpy(dtype=float, na_value=np.nan)
+
+    if method == "iqr":
+        q1, q3 = np.nanpercentile(values, [25, 75])
+        iqr = q3 - q1
+        lower = q1 - multiplier * iqr
+        upper = q3 + multiplier * iqr
+    elif method == "zscore":
+        mean = np.nanmean(values)
+        std = np.nanstd(values, ddof=1)
+        lower = mean - multiplier * std
+        upper = mean + multiplier * std
+    elif method == "percentile":
+        lower_pct = op.get("lower_percentile", 1)
+        upper_pct = op.get("upper_percentile", 99)
+        lower, upper = np.nanpercentile(values, [lower_pct, upper_pct])
     else:
-        log["error"] = f"Unknown operation type: {op_type}"
+        log["error"] = f"Unknown method: {method}"
+        return df, log
+
+    capped_low = int(np.sum(values < lower))
+    capped_high = int(np.sum(values > upper))
+    df[col] = np.clip(values, lower, upper)
+
+    log["capped_low"] = capped_low
+    log["capped_high"] = capped_high
+    log["bounds"] = {"lower": round(float(lower), 4), "upper": round(float(upper), 4)}
+    log["method"] = method
+
+    return df, log
+
+
+def _op_convert_type(df: pd.DataFrame, op: dict, log: dict) -> tuple[pd.DataFrame, dict]:
+    """Convert column to target type."""
+    col = op["column"]
+    target_type = op["target_type"]
+
+    try:
+        if target_type == "int":
+            df[col] = pd.to_numeric(df[col], errors='coerce').astype('Int64')
+        elif target_type == "float":
+            df[col] = pd.to_numeric(df[col], errors='coerce')
+        elif target_type == "string":
+            df[col] = df[col].astype(str).replace('nan', '')
+        elif target_type == "datetime":
+            df[col] = pd.to_datetime(df[col], errors='coerce')
+        elif target_type == "category":
+            df[col] = df[col].astype('category')
+        elif target_type == "boolean":
+            # Map common boolean representations
+            bool_map = {
+                'true': True, 'false': False,
+                'yes': True, 'no': False,
+                '1': True, '0': False,
+                't': True, 'f': False,
+                'y': True, 'n': False,
+            }
+            df[col] = df[col].astype(str).str.lower().map(bool_map)
+
+        log["converted_to"] = target_type
+        log["success"] = True
+    except Exception as e:
+        log["error"] = str(e)
+        log["success"] = False
+
+    return df, log
+
+
+def _op_rename_column(df: pd.DataFrame, op: dict, log: dict) -> tuple[pd.DataFrame, dict]:
+    """Rename a column."""
+    old_name = op["old_name"]
+    new_name = op["new_name"]
+    if old_name in df.columns:
+        df = df.rename(columns={old_name: new_name})
+        log["renamed"] = {old_name: new_name}
+    else:
+        log["error"] = f"Column {old_name} not found"
+
+    return df, log
+
+
+def _op_drop_column(df: pd.DataFrame, op: dict, log: dict) -> tuple[pd.DataFrame, dict]:
+    """Drop one or more columns."""
+    cols = op["columns"] if isinstance(op.get("columns"), list) else [op["column"]]
+    existing = [c for c in cols if c in df.columns]
+    df = df.drop(columns=existing)
+    log["dropped_columns"] = existing
 
     return df, log
 
 
+OP_HANDLERS = {
+    "fill_missing": _op_fill_missing,
+    "drop_missing": _op_drop_missing,
+    "remove_duplicates": _op_remove_duplicates,
+    "normalize_strings": _op_normalize_strings,
+    "standardize_dates": _op_standardize_dates,
+    "normalize_phones": _op_normalize_phones,
+    "validate_emails": _op_validate_emails,
+    "cap_outliers": _op_cap_outliers,
+    "convert_type": _op_convert_type,
+    "rename_column": _op_rename_column,
+    "drop_column": _op_drop_column,
+}
+
+
+def apply_operation(df: pd.DataFrame, op: dict) -> tuple[pd.DataFrame, dict]:
+    """Apply single operation, return modified df and change log."""
+    op_type = op["type"]
+    log = {"operation": op_type, "column": op.get("column"), "timestamp": datetime.now().isoformat()}
+
+    handler = OP_HANDLERS.get(op_type)
+    if handler is None:
+        log["error"] = f"Unknown operation type: {op_type}"
+        return df, log
+    return handler(df, op, log)
+
+
 def generate_report(logs: list, input_path: str, output_path: str) -> str:
     """Generate markdown report of cleaning operations."""
     report = f"""# Data Cleaning Report
@@ -319,22 +408,131 @@ def generate_report(logs: list, input_path: str, output_path: str) -> str:
     return report
 
 
-def clean(input_path: str, output_path: str, operations: list) -> tuple[list, pd.DataFrame]:
-    """Apply cleaning operations and return logs and cleaned dataframe."""
-    encoding = detect_encoding(input_path)
-    df = pd.read_csv(input_path, encoding=encoding)
+# Operations that only ever look at one row, so they can run chunk by chunk
+ROWWISE_OPS = {
+    "normalize_strings", "standardize_dates", "normalize_phones", "validate_emails",
+    "convert_type", "rename_column", "drop_column", "drop_missing",
+}
+CHUNK_ROWS = 100_000
+
 
-    logs = []
-    for op in operations:
-        df, log = apply_operation(df.copy(), op)
-        logs.append(log)
+def is_rowwise(op: dict) -> bool:
+    """Check if operation result for a row is independent of other rows."""
+    if op["type"] == "fill_missing":
+        return op.get("strategy") == "constant"
+    if op["type"] == "convert_type":
+        # Per-chunk categories would differ
+        return op.get("target_type") != "category"
+    return op["type"] in ROWWISE_OPS
 
-        # Check for errors and continue
+
+def merge_chunk_logs(chunk_logs: list) -> dict:
+    """Combine one operation's per-chunk logs, summing counts."""
+    merged = dict(chunk_logs[0])
+    for log in chunk_logs[1:]:
+        for key, value in log.items():
+            if key in merged and isinstance(value, int) and not isinstance(value, bool):
+                merged[key] += value
+            else:
+                merged.setdefault(key, value)
+    # Early chunks may have had nothing to fill while later ones did
+    if merged.get("filled"):
+        merged.pop("note", None)
+    return merged
+
+
+def clean_chunked(input_path: str, output_path: str, operations: list,
+                  encoding: str, dtype: dict = None):
+    """Stream row-wise operations over CSV chunks, writing each as it's done.
+
+    Returns None when the chunks can't be typed the way a full read would
+    type the file; the caller then cleans it whole.
+    """
+    chunk_logs = [[] for _ in operations]
+    rows = 0
+    dtypes = None
+
+    # Chunks are typed like a full read, so output matches the whole-frame path
+    with pd.read_csv(input_path, encoding=encoding, dtype=dtype, chunksize=CHUNK_ROWS) as reader:
+        for i, chunk in enumerate(reader):
+            if dtypes is None:
+                dtypes = chunk.dtypes
+            elif not chunk.dtypes.equals(dtypes):
+                if dtype is not None:
+                    return None
+                # Chunks inferred a column differently; restart with the
+                # types a full read settles on
+                unified = unified_dtypes(input_path, encoding)
+                if unified is None:
+                    return None
+                return clean_chunked(input_path, output_path, operations, encoding, unified)
+            for op, op_logs in zip(operations, chunk_logs):
+                chunk, log = apply_operation(chunk, op)
+                op_logs.append(log)
+            chunk.to_csv(output_path, mode='w' if i == 0 else 'a', header=i == 0,
+                         index=False, encoding='utf-8')
+            rows += len(chunk)
+
+    return [merge_chunk_logs(op_logs) for op_logs in chunk_logs], rows
+
+
+def unified_dtypes(input_path: str, encoding: str):
+    """Column dtypes of a full read, from per-chunk inference (None if not reproducible)."""
+    seen = {}
+    nulls = {}
+    with pd.read_csv(input_path, encoding=encoding, chunksize=CHUNK_ROWS) as reader:
+        for chunk in reader:
+            counts = chunk.notna().sum()
+            for col in chunk.columns:
+                nulls[col] = nulls.get(col, False) or counts[col] < len(chunk)
+                # An all-null chunk says nothing about the column's type
+                if counts[col]:
+                    seen.setdefault(col, set()).add(chunk[col].dtype)
+
+    dtypes = {}
+    for col, kinds in seen.items():
+        if len(kinds) == 1:
+            dtype = next(iter(kinds))
+        elif all(k.kind in 'iuf' for k in kinds):
+            dtype = np.dtype('float64')
+        else:
+            # Mixed columns come out as per-block Python objects
+            return None
+        if nulls[col] and dtype.kind in 'iu':
+            dtype = np.dtype('float64')
+        elif nulls[col] and dtype.kind == 'b':
+            return None
+        dtypes[col] = dtype
+    return dtypes
+
+
+def clean(input_path: str, output_path: str, operations: list) -> tuple[list, int]:
+    """Apply cleaning operations, write output, return logs and output row count."""
+    encoding, _ = detect_encoding(input_path)
+
+    chunked = None
+    if all(is_rowwise(op) for op in operations):
+        chunked = clean_chunked(input_path, output_path, operations, encoding)
+    if chunked is not None:
+        logs, rows = chunked
+    else:
+        # Frame-wide statistics (mean, duplicates, outliers, ...) need every row
+        # C parser: untouched values must round-trip exactly, and pyarrow
+        # reformats the timestamps it infers
+        df = pd.read_csv(input_path, encoding=encoding)
+        logs = []
+        for op in operations:
+            df, log = apply_operation(df, op)
+            logs.append(log)
+        df.to_csv(output_path, index=False, encoding='utf-8')
+        rows = len(df)
+
+    # Report errors and continue
+    for log in logs:
         if "error" in log:
             print(f"Warning: {log['error']}", file=sys.stderr)
 
-    df.to_csv(output_path, index=False, encoding='utf-8')
-    return logs, df
+    return logs, rows
 
 
 if __name__ == "__main__":
@@ -367,10 +565,10 @@ if __name__ == "__main__":
         with open(ops_path) as f:
             ops_data = json.load(f)
 
-        logs, df = clean(input_path, output_path, ops_data["operations"])
+        logs, rows = clean(input_path, output_path, ops_data["operations"])
 
         # Output logs
-        print(json.dumps({"logs": logs, "output_rows": len(df)}, indent=2, ensure_ascii=False))
+        print(json.dumps({"logs": logs, "output_rows": rows}, indent=2, ensure_ascii=False))
 
         # Generate report if requested
         if report_path:
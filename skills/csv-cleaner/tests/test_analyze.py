@@ -0,0 +1,30 @@
+import sys
+from pathlib import Path
+
+import chardet
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+from analyze import DETECT_CHUNK_SIZE, detect_encoding
+
+
+def test_detect_encoding_sees_non_ascii_after_first_chunk(tmp_path):
+    # ASCII for more than one detection chunk, Latin-1 after that
+    rows = [b"id,name"]
+    i = 0
+    while sum(len(r) + 1 for r in rows) < DETECT_CHUNK_SIZE + 4096:
+        rows.append(b"%d,name%d" % (i, i))
+        i += 1
+    while sum(len(r) + 1 for r in rows) < DETECT_CHUNK_SIZE + 9000:
+        rows.append(b"%d,caf\xe9%d" % (i, i))
+        i += 1
+    data = b"\n".join(rows) + b"\n"
+    path = tmp_path / "mixed.csv"
+    path.write_bytes(data)
+
+    encoding, _ = detect_encoding(str(path))
+
+    assert encoding != "utf-8"
+    # Same answer as the one-shot chardet.detect the detector replaced
+    assert encoding == chardet.detect(data[:100000])["encoding"]
+    data.decode(encoding)
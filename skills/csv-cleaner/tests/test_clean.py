@@ -0,0 +1,37 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+import clean
+
+
+def write_fixture(path):
+    rows = ["id,price,name,note,flag"]
+    for i in range(30):
+        # Nulls in price and text in note only appear after the first chunk
+        price = "" if i in (17, 25) else f"{i}.50"
+        note = f"note {i}" if i >= 12 else ""
+        rows.append(f"{i},{price}, name {i} ,{note},{'true' if i % 2 else 'false'}")
+    path.write_text("\n".join(rows) + "\n")
+
+
+def test_streaming_matches_whole_frame_output(tmp_path, monkeypatch):
+    monkeypatch.setattr(clean, "CHUNK_ROWS", 10)
+    input_path = tmp_path / "input.csv"
+    write_fixture(input_path)
+    rowwise = [
+        {"type": "fill_missing", "column": "price", "strategy": "constant", "value": 0},
+        {"type": "normalize_strings", "column": "name", "ops": ["trim"]},
+    ]
+    streamed = tmp_path / "streamed.csv"
+    whole = tmp_path / "whole.csv"
+
+    clean.clean(str(input_path), str(streamed), rowwise)
+    # A frame-wide op that changes nothing forces the whole-frame path
+    clean.clean(str(input_path), str(whole), rowwise + [{"type": "remove_duplicates"}])
+
+    assert streamed.read_bytes() == whole.read_bytes()
+    lines = streamed.read_text().splitlines()
+    assert lines[1] == "0,0.5,name 0,,False"
+    assert lines[18] == "17,0.0,name 17,note 17,True"
@@ -7,39 +7,134 @@ Usage:
 """
 
 import argparse
+import io
 import json
+import os
+import re
 import sys
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from itertools import combinations
 from typing import Optional
 
 try:
+    import numpy as np
     import pandas as pd
 except ImportError:
     print("Error: pandas required. Install with: pip install pandas")
     sys.exit(1)
 
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+ZIP_RE = re.compile(r"^\d{5}(-\d{4})?$")
+EMAIL_RE = re.compile(r"^[\w\.-]+@[\w\.-]+\.\w+$")
+DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}")
+
+
+CHUNK_ROWS = 200_000
+
 
 def load_csv(path: str, sample: Optional[int] = None) -> pd.DataFrame:
     """Load CSV file, optionally sampling rows."""
-    df = pd.read_csv(path)
-    if sample and len(df) > sample:
-        df = df.sample(n=sample, random_state=42)
+    if sample:
+        n_rows = sum(len(chunk) for chunk in
+                     pd.read_csv(path, usecols=[0], chunksize=CHUNK_ROWS))
+        if n_rows > sample:
+            return compact_dtypes(stream_sample(path, n_rows, sample))
+    return compact_dtypes(pd.read_csv(path))
+
+
+def stream_sample(path: str, n_rows: int, sample: int) -> pd.DataFrame:
+    """Sample rows chunk by chunk, never holding the full file in memory."""
+    # Same rows, in the same order, as df.sample(n=sample, random_state=42)
+    positions = np.random.RandomState(42).choice(n_rows, size=sample, replace=False)
+    wanted = np.sort(positions)
+
+    kept = []
+    offset = 0
+    for chunk in pd.read_csv(path, dtype=str, chunksize=CHUNK_ROWS):
+        lo, hi = np.searchsorted(wanted, [offset, offset + len(chunk)])
+        kept.append(chunk.iloc[wanted[lo:hi] - offset])
+        offset += len(chunk)
+    # Chunks were read as text so their dtypes can't disagree; infer the
+    # column types once over the sampled rows
+    return infer_dtypes(pd.concat(kept).loc[positions])
+
+
+def infer_dtypes(text_df: pd.DataFrame) -> pd.DataFrame:
+    """Apply read_csv's type inference to a frame of raw CSV text."""
+    buffer = io.StringIO()
+    text_df.to_csv(buffer, index=False)
+    buffer.seek(0)
+    return pd.read_csv(buffer)
+
+
+def compact_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """Shrink column storage without changing values."""
+    return categorize_strings(downcast_integers(df))
+
+
+def downcast_integers(df: pd.DataFrame) -> pd.DataFrame:
+    """Store integer columns in the smallest integer dtype that fits."""
+    # Floats stay float64: float32 would round values written back out
+    for col in df.select_dtypes(include=["integer"]).columns:
+        df[col] = pd.to_numeric(df[col], downcast="integer")
     return df
 
 
-def infer_column_types(df: pd.DataFrame) -> dict:
+def logical_dtype(series: pd.Series) -> str:
+    """dtype as read from the CSV, ignoring compact storage."""
+    dtype = series.dtype
+    if isinstance(dtype, pd.CategoricalDtype):
+        dtype = dtype.categories.dtype
+    if pd.api.types.is_signed_integer_dtype(dtype):
+        return "int64"
+    return str(dtype)
+
+
+def categorize_strings(df: pd.DataFrame, max_ratio: float = 0.5) -> pd.DataFrame:
+    """Store low-cardinality string columns as category (integer codes)."""
+    for col in df.select_dtypes(include=["object", "string"]).columns:
+        if len(df) and df[col].nunique() / len(df) < max_ratio:
+            df[col] = df[col].astype("category")
+    return df
+
+
+def column_counts(df: pd.DataFrame) -> tuple:
+    """Distinct non-null values and null count per column, one pass each."""
+    return df.nunique(dropna=True), df.isna().sum()
+
+
+def column_samples(df: pd.DataFrame, size: int = 100) -> dict:
+    """First `size` non-null values of each column, without copying the rest."""
+    samples = {}
+    for col in df.columns:
+        series = df[col]
+        samples[col] = series.iloc[np.flatnonzero(series.notna().to_numpy())[:size]]
+    return samples
+
+
+def infer_column_types(df: pd.DataFrame, counts: Optional[tuple] = None,
+                       samples: Optional[dict] = None) -> dict:
     """Infer semantic types for each column."""
+    nunique, null_counts = counts or column_counts(df)
+    samples = samples or column_samples(df)
     types = {}
     for col in df.columns:
-        series = df[col].dropna()
-        if len(series) == 0:
+        non_null = len(df) - int(null_counts[col])
+        if non_null == 0:
             types[col] = {"type": "empty", "nullable": True}
             continue
 
-        dtype = str(df[col].dtype)
-        null_ratio = df[col].isna().sum() / len(df)
-        unique_ratio = series.nunique() / len(series)
+        series = samples[col]
+
+        dtype = logical_dtype(df[col])
+        null_ratio = null_counts[col] / len(df)
+        unique_ratio = nunique[col] / non_null
 
         # Infer semantic type
         if unique_ratio == 1.0:
@@ -47,13 +142,13 @@ def infer_column_types(df: pd.DataFrame) -> dict:
         elif dtype in ("int64", "float64"):
             semantic = "numeric"
         elif dtype == "object":
-            # Check for patterns
-            sample_vals = series.head(100).astype(str)
-            if sample_vals.str.match(r"^\d{5}(-\d{4})?$").all():
+            # Check for patterns; all() stops at the first non-matching value
+            sample_vals = series.astype(str).tolist()
+            if all(ZIP_RE.match(v) for v in sample_vals):
                 semantic = "zip_code"
-            elif sample_vals.str.match(r"^[\w\.-]+@[\w\.-]+\.\w+$").all():
+            elif all(EMAIL_RE.match(v) for v in sample_vals):
                 semantic = "email"
-            elif sample_vals.str.match(r"^\d{4}-\d{2}-\d{2}").any():
+            elif any(DATE_RE.match(v) for v in sample_vals):
                 semantic = "date"
             else:
                 semantic = "text"
@@ -65,89 +160,215 @@ def infer_column_types(df: pd.DataFrame) -> dict:
             "semantic_type": semantic,
             "null_ratio": round(null_ratio, 4),
             "unique_ratio": round(unique_ratio, 4),
-            "unique_count": int(series.nunique()),
+            "unique_count": int(nunique[col]),
             "sample_values": series.head(5).tolist()
         }
     return types
 
 
-def check_fd(df: pd.DataFrame, determinant: list, dependent: str) -> dict:
-    """Check if functional dependency holds."""
-    # Group by determinant, count unique dependent values per group
-    if df[determinant].isna().any().any() or df[dependent].isna().any():
-        # Filter out nulls for FD check
-        mask = ~df[determinant + [dependent]].isna().any(axis=1)
-        df_clean = df[mask]
-    else:
-        df_clean = df
+def factorize_columns(df: pd.DataFrame) -> dict:
+    """Encode each column once as int32 partition codes (-1 for null)."""
+    return {col: pd.factorize(df[col])[0].astype(np.int32) for col in df.columns}
+
+
+def combine_codes(codes_a: np.ndarray, codes_b: np.ndarray) -> np.ndarray:
+    """Codes of the product partition of two columns (null if either is null)."""
+    combined = codes_a.astype(np.int64) * (int(codes_b.max()) + 1) + codes_b
+    if codes_a.min(initial=0) >= 0 and codes_b.min(initial=0) >= 0:
+        return pd.factorize(combined)[0].astype(np.int32)
 
-    if len(df_clean) == 0:
+    valid = (codes_a >= 0) & (codes_b >= 0)
+    codes = np.full(len(combined), -1, dtype=np.int32)
+    codes[valid] = pd.factorize(combined[valid])[0]
+    return codes
+
+
+def determinant_codes(codes: dict, determinant: list) -> np.ndarray:
+    """Partition codes for a (possibly multi-column) determinant."""
+    result = codes[determinant[0]]
+    for col in determinant[1:]:
+        result = combine_codes(result, codes[col])
+    return result
+
+
+def sort_partition(det: np.ndarray) -> tuple:
+    """Row order with det's classes contiguous (nulls dropped), and class offsets."""
+    order = np.argsort(det, kind="stable")
+    sorted_det = det[order]
+    first = np.searchsorted(sorted_det, 0)
+    order, sorted_det = order[first:], sorted_det[first:]
+    starts = np.flatnonzero(np.diff(sorted_det)) + 1
+    return order, np.concatenate(([0], starts))
+
+
+def count_violations(order: np.ndarray, starts: np.ndarray, dep: np.ndarray) -> tuple:
+    """Walk det classes in sorted order: (classes with a dep value, classes that split)."""
+    groups = 0
+    violations = 0
+    for i in range(len(starts)):
+        end = starts[i + 1] if i + 1 < len(starts) else len(order)
+        first = -1
+        split = False
+        for j in range(starts[i], end):
+            value = dep[order[j]]
+            if value < 0:
+                continue
+            if first < 0:
+                first = value
+            elif value != first:
+                split = True
+                break
+        if first >= 0:
+            groups += 1
+            if split:
+                violations += 1
+    return groups, violations
+
+
+if njit is not None:
+    count_violations = njit(cache=True, nogil=True)(count_violations)
+
+
+def check_fd_codes(partition: tuple, dep: np.ndarray, dep_nulls: bool = True) -> dict:
+    """Check det -> dep: a det class violates if its dep codes aren't all equal."""
+    order, starts = partition
+    if len(order) == 0:
         return {"holds": False, "confidence": 0, "violations": 0}
 
-    groups = df_clean.groupby(determinant)[dependent].nunique()
-    violations = (groups > 1).sum()
-    total_groups = len(groups)
+    if njit is not None:
+        total_groups, violations = count_violations(order, starts, dep)
+    else:
+        # Min/max of the dep codes per det class
+        values = dep[order]
+        high = np.maximum.reduceat(values, starts)
+        if dep_nulls:
+            # Nulls (-1) never raise the max and are lifted out of the min's
+            # way; classes whose dependent is entirely null don't count
+            low = np.minimum.reduceat(np.where(values < 0, np.iinfo(values.dtype).max, values), starts)
+            populated = high >= 0
+            total_groups = int(np.count_nonzero(populated))
+            violations = int(np.count_nonzero(populated & (low < high)))
+        else:
+            low = np.minimum.reduceat(values, starts)
+            total_groups = len(starts)
+            violations = int(np.count_nonzero(low < high))
+
+    if total_groups == 0:
+        return {"holds": False, "confidence": 0, "violations": 0}
 
-    confidence = 1.0 - (violations / total_groups) if total_groups > 0 else 0
+    confidence = 1.0 - (violations / total_groups)
 
     return {
         "holds": violations == 0,
         "confidence": round(confidence, 4),
-        "violations": int(violations),
-        "total_groups": int(total_groups)
+        "violations": violations,
+        "total_groups": total_groups
     }
 
 
+def code_stats(codes: np.ndarray) -> tuple:
+    """(number of distinct non-null values, whether any value is null)."""
+    return int(codes.max(initial=-1)) + 1, bool((codes < 0).any())
+
+
+def shortcut_fd(det_stats: tuple, dep_stats: tuple,
+                confidence_threshold: float) -> Optional[dict]:
+    """Decide an FD from cardinalities alone; None if it needs a full check."""
+    det_card, det_nulls = det_stats
+    dep_card, dep_nulls = dep_stats
+
+    # A constant, fully populated dependent is determined by any determinant
+    if dep_card == 1 and not dep_nulls and det_card > 0:
+        return {"holds": True, "confidence": 1.0, "violations": 0,
+                "total_groups": det_card}
+
+    # More dependent values than determinant groups forces at least one
+    # violation, capping confidence at 1 - 1/groups. Only sound when the
+    # determinant has no nulls (otherwise dropped rows may hide values).
+    if not det_nulls and 0 < det_card < dep_card and 1 - 1 / det_card < confidence_threshold:
+        return {"holds": False, "confidence": 0, "violations": 0}
+
+    return None
+
+
+def check_fd(df: pd.DataFrame, determinant: list, dependent: str) -> dict:
+    """Check if functional dependency holds."""
+    codes = factorize_columns(df[list(determinant) + [dependent]])
+    partition = sort_partition(determinant_codes(codes, determinant))
+    return check_fd_codes(partition, codes[dependent])
+
+
 def detect_fds(df: pd.DataFrame, confidence_threshold: float = 0.8) -> list:
     """Detect functional dependencies between columns."""
     fds = []
     columns = list(df.columns)
-
-    # Check single-column determinants
-    for det_col in columns:
-        for dep_col in columns:
-            if det_col == dep_col:
-                continue
-
-            result = check_fd(df, [det_col], dep_col)
+    codes = factorize_columns(df)
+    stats = {col: code_stats(c) for col, c in codes.items()}
+
+    def check_determinant(task: tuple) -> list:
+        # Sort the determinant once and check each candidate dependent against it
+        determinant, dependents = task
+        if not dependents:
+            return []
+        det_codes = determinant_codes(codes, determinant)
+        partition = sort_partition(det_codes)
+        det_stats = code_stats(det_codes)
+        found = []
+        for dep_col in dependents:
+            result = (shortcut_fd(det_stats, stats[dep_col], confidence_threshold)
+                      or check_fd_codes(partition, codes[dep_col], stats[dep_col][1]))
             if result["confidence"] >= confidence_threshold:
+                found.append((dep_col, result))
+        return found
+
+    # Determinants are independent and only read the shared codes, so
+    # check them concurrently (NumPy and the Numba kernel release the GIL)
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        # Check single-column determinants
+        singles = [([c], [d for d in columns if d != c]) for c in columns]
+        for (det_cols, _), found in zip(singles, executor.map(check_determinant, singles)):
+            for dep_col, result in found:
                 fds.append({
-                    "determinant": [det_col],
+                    "determinant": det_cols,
                     "dependent": dep_col,
                     **result,
                     "status": "confirmed" if result["confidence"] == 1.0 else "needs_review"
                 })
 
-    # Check two-column determinants for remaining high-cardinality columns
-    high_card_cols = [c for c in columns
-                      if df[c].nunique() / len(df) > 0.5]
+        # Check two-column determinants for remaining high-cardinality columns
+        high_card_cols = [c for c in columns
+                          if stats[c][0] / len(df) > 0.5]
 
-    for det_cols in combinations(high_card_cols, 2):
-        for dep_col in columns:
-            if dep_col in det_cols:
-                continue
-
-            result = check_fd(df, list(det_cols), dep_col)
-            if result["confidence"] >= confidence_threshold:
-                # Only add if not already determined by single column
-                single_determines = any(
-                    fd["determinant"] == [det_cols[0]] and fd["dependent"] == dep_col
-                    or fd["determinant"] == [det_cols[1]] and fd["dependent"] == dep_col
-                    for fd in fds if fd["confidence"] == 1.0
-                )
-                if not single_determines:
-                    fds.append({
-                        "determinant": list(det_cols),
-                        "dependent": dep_col,
-                        **result,
-                        "status": "confirmed" if result["confidence"] == 1.0 else "needs_review"
-                    })
+        # Lattice pruning: a dependent already exactly determined by a subset
+        # of the pair gains nothing from the pair, so it isn't tested at all
+        found_lhs_for = defaultdict(list)
+        for fd in fds:
+            if fd["confidence"] == 1.0:
+                found_lhs_for[fd["dependent"]].append(frozenset(fd["determinant"]))
+
+        pairs = []
+        for det_cols in combinations(high_card_cols, 2):
+            det_set = frozenset(det_cols)
+            dependents = [d for d in columns if d not in det_set
+                          and not any(lhs <= det_set for lhs in found_lhs_for[d])]
+            pairs.append((list(det_cols), dependents))
+
+        for (det_cols, _), found in zip(pairs, executor.map(check_determinant, pairs)):
+            for dep_col, result in found:
+                fds.append({
+                    "determinant": det_cols,
+                    "dependent": dep_col,
+                    **result,
+                    "status": "confirmed" if result["confidence"] == 1.0 else "needs_review"
+                })
 
     return fds
 
 
-def find_candidate_keys(df: pd.DataFrame, fds: list) -> list:
+def find_candidate_keys(df: pd.DataFrame, fds: list,
+                        counts: Optional[tuple] = None) -> list:
     """Find candidate keys based on detected FDs."""
+    nunique, null_counts = counts or column_counts(df)
     columns = set(df.columns)
     candidate_keys = []
 
@@ -169,9 +390,11 @@ def find_candidate_keys(df: pd.DataFrame, fds: list) -> list:
             })
 
     # Also check for unique columns (trivial keys)
+    single_keys = {ck["columns"][0] for ck in candidate_keys if len(ck["columns"]) == 1}
     for col in columns:
-        if df[col].nunique() == len(df) and not df[col].isna().any():
-            if not any(set(ck["columns"]) == {col} for ck in candidate_keys):
+        if nunique[col] == len(df) and not null_counts[col]:
+            if col not in single_keys:
+                single_keys.add(col)
                 candidate_keys.append({
                     "columns": [col],
                     "is_minimal": True
@@ -180,8 +403,10 @@ def find_candidate_keys(df: pd.DataFrame, fds: list) -> list:
     return candidate_keys
 
 
-def assess_normal_form(df: pd.DataFrame, fds: list, candidate_keys: list) -> dict:
+def assess_normal_form(df: pd.DataFrame, fds: list, candidate_keys: list,
+                       samples: Optional[dict] = None) -> dict:
     """Assess current normal form and identify violations."""
+    samples = samples or column_samples(df)
     violations = {"1NF": [], "2NF": [], "3NF": [], "BCNF": []}
 
     # Get key columns
@@ -189,37 +414,37 @@ def assess_normal_form(df: pd.DataFrame, fds: list, candidate_keys: list) -> dic
     for ck in candidate_keys:
         key_cols.update(ck["columns"])
 
-    confirmed_fds = [fd for fd in fds if fd["confidence"] == 1.0]
+    # Determinant and key sets built once, not per comparison
+    confirmed_fds = [(fd, frozenset(fd["determinant"]))
+                     for fd in fds if fd["confidence"] == 1.0]
+    key_sets = [frozenset(ck["columns"]) for ck in candidate_keys]
 
     # Check 1NF (assume atomic if loaded into pandas)
     # Could check for delimiter-separated values
     for col in df.columns:
-        sample = df[col].dropna().head(100).astype(str)
+        sample = samples[col].astype(str)
         if sample.str.contains(r"[,;|]").mean() > 0.3:
             violations["1NF"].append(f"Column '{col}' may contain non-atomic values")
 
     # Check 2NF (partial dependencies)
-    for ck in candidate_keys:
-        if len(ck["columns"]) > 1:
-            for fd in confirmed_fds:
-                det = set(fd["determinant"])
-                if det < set(ck["columns"]) and fd["dependent"] not in ck["columns"]:
+    for ck_set in key_sets:
+        if len(ck_set) > 1:
+            for fd, det in confirmed_fds:
+                if det < ck_set and fd["dependent"] not in ck_set:
                     violations["2NF"].append(
                         f"Partial dependency: {fd['determinant']} → {fd['dependent']}"
                     )
 
     # Check 3NF (transitive dependencies)
-    for fd in confirmed_fds:
-        det = set(fd["determinant"])
+    for fd, det in confirmed_fds:
         if not det.intersection(key_cols) and fd["dependent"] not in key_cols:
             violations["3NF"].append(
                 f"Transitive dependency: {fd['determinant']} → {fd['dependent']}"
             )
 
     # Check BCNF (determinant must be superkey)
-    for fd in confirmed_fds:
-        det = set(fd["determinant"])
-        is_superkey = any(set(ck["columns"]).issubset(det) for ck in candidate_keys)
+    for fd, det in confirmed_fds:
+        is_superkey = any(ck_set <= det for ck_set in key_sets)
         if not is_superkey:
             violations["BCNF"].append(
                 f"Non-superkey determinant: {fd['determinant']} → {fd['dependent']}"
@@ -301,16 +526,18 @@ def analyze(csv_path: str, output_path: Optional[str] = None,
     print(f"  Rows: {len(df)}, Columns: {len(df.columns)}")
 
     # Analysis steps
-    column_types = infer_column_types(df)
+    counts = column_counts(df)
+    samples = column_samples(df)
+    column_types = infer_column_types(df, counts, samples)
     print("  Column types inferred")
 
     fds = detect_fds(df)
     print(f"  Found {len(fds)} functional dependencies")
 
-    candidate_keys = find_candidate_keys(df, fds)
+    candidate_keys = find_candidate_keys(df, fds, counts)
     print(f"  Found {len(candidate_keys)} candidate key(s)")
 
-    nf_assessment = assess_normal_form(df, fds, candidate_keys)
+    nf_assessment = assess_normal_form(df, fds, candidate_keys, samples)
     print(f"  Current normal form: {nf_assessment['current_normal_form']}")
 
     questions = generate_questions(fds, column_types)
@@ -8,17 +8,22 @@ Usage:
 
 import argparse
 import json
+import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional
 from collections import defaultdict
 
 try:
+    import numpy as np
     import pandas as pd
 except ImportError:
     print("Error: pandas required. Install with: pip install pandas")
     sys.exit(1)
 
+from analyze import compact_dtypes, factorize_columns, logical_dtype
+
 
 def load_config(config_path: str) -> dict:
     """Load normalization configuration."""
@@ -46,13 +51,13 @@ def compute_minimal_cover(fds: list) -> list:
 
     # Step 3: Remove redundant attributes from determinants
     final = []
+    result_closure = closure_under(result)
     for fd in result:
         det = fd["determinant"]
         if len(det) > 1:
             for attr in det:
                 reduced_det = [a for a in det if a != attr]
-                test_fd = {"determinant": reduced_det, "dependent": fd["dependent"]}
-                if is_derivable(test_fd, result):
+                if fd["dependent"] in result_closure(reduced_det):
                     det = reduced_det
                     break
         final.append({"determinant": det, "dependent": fd["dependent"]})
@@ -62,32 +67,47 @@ def compute_minimal_cover(fds: list) -> list:
 
 def is_derivable(fd: dict, fd_set: list) -> bool:
     """Check if fd is derivable from fd_set using closure."""
-    closure = set(fd["determinant"])
-
-    changed = True
-    while changed:
-        changed = False
-        for other in fd_set:
-            if set(other["determinant"]).issubset(closure):
-                if other["dependent"] not in closure:
-                    closure.add(other["dependent"])
-                    changed = True
-
-    return fd["dependent"] in closure
+    return fd["dependent"] in compute_closure(fd["determinant"], fd_set)
 
 
 def compute_closure(attrs: set, fds: list) -> set:
     """Compute attribute closure under FDs."""
-    closure = set(attrs)
-
-    changed = True
-    while changed:
-        changed = False
-        for fd in fds:
-            if set(fd["determinant"]).issubset(closure):
-                if fd["dependent"] not in closure:
-                    closure.add(fd["dependent"])
-                    changed = True
+    return closure_under(fds)(attrs)
+
+
+def closure_under(fds: list):
+    """Closure function for a fixed FD list, indexing the FDs once.
+
+    Closures are memoized per returned function, so the memo lives only as
+    long as the caller that checks many attribute sets against one FD list.
+    """
+    # Linear-time closure: each FD waits on a count of determinant
+    # attributes not yet in the closure, indexed by attribute
+    deps = [fd["dependent"] for fd in fds]
+    det_sizes = [len(set(fd["determinant"])) for fd in fds]
+    fds_by_attr = defaultdict(list)
+    for i, fd in enumerate(fds):
+        for attr in set(fd["determinant"]):
+            fds_by_attr[attr].append(i)
+    # FDs with an empty determinant hold unconditionally
+    unconditional = {dep for dep, size in zip(deps, det_sizes) if not size}
+    memo = {}
+
+    def closure(attrs) -> set:
+        key = frozenset(attrs)
+        if key not in memo:
+            unsatisfied = list(det_sizes)
+            result = set(key) | unconditional
+            worklist = list(result)
+            while worklist:
+                attr = worklist.pop()
+                for i in fds_by_attr.get(attr, ()):
+                    unsatisfied[i] -= 1
+                    if unsatisfied[i] == 0 and deps[i] not in result:
+                        result.add(deps[i])
+                        worklist.append(deps[i])
+            memo[key] = frozenset(result)
+        return set(memo[key])
 
     return closure
 
@@ -150,20 +170,17 @@ def decompose_3nf(columns: list, fds: list, candidate_keys: list) -> list:
 def decompose_bcnf(columns: list, fds: list, candidate_keys: list) -> list:
     """Decompose relation into BCNF."""
 
-    def is_superkey(det: set, all_cols: set, fds: list) -> bool:
-        closure = compute_closure(det, fds)
-        return all_cols.issubset(closure)
-
     def bcnf_decompose(cols: list, fds: list) -> list:
         col_set = set(cols)
         relevant_fds = [fd for fd in fds
                        if set(fd["determinant"]).issubset(col_set)
                        and fd["dependent"] in col_set]
+        closure = closure_under(relevant_fds)
 
         # Find violating FD
         for fd in relevant_fds:
             det = set(fd["determinant"])
-            if not is_superkey(det, col_set, relevant_fds):
+            if not col_set.issubset(closure(det)):
                 # Decompose
                 r1_cols = list(det | {fd["dependent"]})
                 r2_cols = list(col_set - {fd["dependent"]} | det)
@@ -206,10 +223,10 @@ def find_key(columns: list, fds: list, candidate_keys: list) -> list:
                    if set(fd["determinant"]).issubset(col_set)
                    and fd["dependent"] in col_set]
 
+    closure = closure_under(relevant_fds)
     for fd in relevant_fds:
         det = set(fd["determinant"])
-        closure = compute_closure(det, relevant_fds)
-        if col_set.issubset(closure):
+        if col_set.issubset(closure(det)):
             return list(det)
 
     return columns  # Fallback: all columns are key
@@ -227,7 +244,7 @@ def generate_table_name(key_cols: list, dep_cols: list) -> str:
 
 def infer_sql_type(series: pd.Series) -> str:
     """Infer SQL data type from pandas series."""
-    dtype = str(series.dtype)
+    dtype = logical_dtype(series)
 
     if dtype == "int64":
         if series.max() < 2147483647:
@@ -240,7 +257,11 @@ def infer_sql_type(series: pd.Series) -> str:
     elif dtype == "datetime64[ns]":
         return "TIMESTAMP"
     else:
-        max_len = series.dropna().astype(str).str.len().max()
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            # Longest value from the category dictionary, not every row
+            max_len = series.cat.categories.astype(str).str.len().max()
+        else:
+            max_len = series.dropna().astype(str).str.len().max()
         if pd.isna(max_len):
             max_len = 255
         return f"VARCHAR({int(max_len) + 50})"
@@ -288,15 +309,14 @@ def generate_mermaid_erd(tables: list, foreign_keys: list) -> str:
         child = fk["child_table"]
         lines.append(f"    {parent} ||--o{{ {child} : has")
 
+    fk_cols = {(fk["child_table"], fk["column"]) for fk in foreign_keys}
+
     # Add table definitions
     for table in tables:
         lines.append(f"    {table['name']} {{")
         for col in table["columns"]:
             pk_mark = "PK" if col in table["primary_key"] else ""
-            fk_mark = "FK" if any(
-                fk["child_table"] == table["name"] and fk["column"] == col
-                for fk in foreign_keys
-            ) else ""
+            fk_mark = "FK" if (table["name"], col) in fk_cols else ""
             marks = ",".join(filter(None, [pk_mark, fk_mark]))
             marks_str = f" {marks}" if marks else ""
             lines.append(f"        string {col}{marks_str}")
@@ -326,33 +346,52 @@ def compute_foreign_keys(tables: list) -> list:
     """Compute foreign key relationships between tables."""
     foreign_keys = []
 
+    # Tables owning each single-column primary key, in table order
+    pk_owners = defaultdict(list)
+    for i, table in enumerate(tables):
+        if len(set(table["primary_key"])) == 1:
+            pk_owners[table["primary_key"][0]].append((i, table["name"]))
+
     for table in tables:
         pk_set = set(table["primary_key"])
         non_pk_cols = [c for c in table["columns"] if c not in pk_set]
 
-        for other_table in tables:
-            if other_table["name"] == table["name"]:
-                continue
+        # A non-PK column that is another table's PK references that table;
+        # ordered by parent table, then column, as the pairwise scan was
+        refs = sorted(
+            (owner_idx, col_idx, owner, col)
+            for col_idx, col in enumerate(non_pk_cols)
+            for owner_idx, owner in pk_owners.get(col, [])
+            if owner != table["name"]
+        )
+        for _, _, owner, col in refs:
+            foreign_keys.append({
+                "child_table": table["name"],
+                "column": col,
+                "parent_table": owner,
+                "parent_column": col
+            })
 
-            other_pk = set(other_table["primary_key"])
+    return foreign_keys
 
-            # Check if other table's PK is in this table's non-PK columns
-            for col in non_pk_cols:
-                if col in other_pk and len(other_pk) == 1:
-                    foreign_keys.append({
-                        "child_table": table["name"],
-                        "column": col,
-                        "parent_table": other_table["name"],
-                        "parent_column": col
-                    })
 
-    return foreign_keys
+def unique_rows(codes: dict, columns: list) -> np.ndarray:
+    """Positions of the first occurrence of each distinct row over columns."""
+    key = np.zeros(len(codes[columns[0]]), dtype=np.int64)
+    if len(key) == 0:
+        return np.empty(0, dtype=np.intp)
+    for col in columns:
+        # Shift codes so nulls (-1) become a value of their own, as in drop_duplicates
+        col_codes = codes[col].astype(np.int64) + 1
+        key = pd.factorize(key * (int(col_codes.max()) + 1) + col_codes)[0]
+    _, first = np.unique(key, return_index=True)
+    return np.sort(first)
 
 
 def normalize(csv_path: str, config_path: str, target_nf: str,
               output_dir: str) -> dict:
     """Main normalization function."""
-    df = pd.read_csv(csv_path)
+    df = compact_dtypes(pd.read_csv(csv_path))
     config = load_config(config_path)
 
     print(f"Normalizing {csv_path} to {target_nf}...")
@@ -386,12 +425,21 @@ def normalize(csv_path: str, config_path: str, target_nf: str,
     tables_path = output_path / "tables"
     tables_path.mkdir(exist_ok=True)
 
-    # Write decomposed CSV files
-    for table in tables:
-        table_df = df[table["columns"]].drop_duplicates()
-        table_path = tables_path / f"{table['name']}.csv"
-        table_df.to_csv(table_path, index=False)
-        print(f"  Created {table_path} ({len(table_df)} rows)")
+    # Write decomposed CSV files concurrently, deduplicating on integer codes.
+    # Tables sharing a name only write the last one, as sequential writes would.
+    codes = factorize_columns(df)
+    table_paths = [tables_path / f"{table['name']}.csv" for table in tables]
+    last_for_path = {path: i for i, path in enumerate(table_paths)}
+
+    def write_table(i: int) -> int:
+        table_df = df[tables[i]["columns"]].iloc[unique_rows(codes, tables[i]["columns"])]
+        if last_for_path[table_paths[i]] == i:
+            table_df.to_csv(table_paths[i], index=False)
+        return len(table_df)
+
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        for table_path, rows in zip(table_paths, executor.map(write_table, range(len(tables)))):
+            print(f"  Created {table_path} ({rows} rows)")
 
     # Generate SQL DDL
     sql_ddl = generate_sql_ddl(tables, df, foreign_keys)
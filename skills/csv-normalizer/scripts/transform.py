@@ -8,8 +8,11 @@ Usage:
 
 import argparse
 import json
+import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Optional
 
 try:
     import pandas as pd
@@ -17,6 +20,19 @@ except ImportError:
     print("Error: pandas required. Install with: pip install pandas")
     sys.exit(1)
 
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pacsv
+    # read_csv's default NA markers
+    NA_VALUES = pacsv.ConvertOptions().null_values + ["<NA>", "None"]
+except ImportError:
+    pacsv = None
+
+from analyze import infer_dtypes
+
+CHUNK_ROWS = 200_000
+
 
 def load_config(config_path: str) -> dict:
     """Load transformation configuration."""
@@ -28,6 +44,9 @@ def load_config(config_path: str) -> dict:
         if key not in config:
             raise ValueError(f"Config missing required key: {key}")
 
+    # Built once per config instead of on every validate_input call
+    config["_expected_cols"] = frozenset(config["original_columns"])
+
     return config
 
 
@@ -35,11 +54,10 @@ def validate_input(df: pd.DataFrame, config: dict) -> list:
     """Validate input CSV matches expected structure."""
     errors = []
 
-    expected_cols = set(config["original_columns"])
-    actual_cols = set(df.columns)
+    expected_cols = config.get("_expected_cols") or frozenset(config["original_columns"])
 
-    missing = expected_cols - actual_cols
-    extra = actual_cols - expected_cols
+    missing = set(expected_cols.difference(df.columns))
+    extra = set(df.columns).difference(expected_cols)
 
     if missing:
         errors.append(f"Missing columns: {missing}")
@@ -49,17 +67,152 @@ def validate_input(df: pd.DataFrame, config: dict) -> list:
     return errors
 
 
+def text_chunks(csv_path: str, columns: list, use_arrow: bool = True):
+    """Yield the given CSV columns as frames of raw text, about CHUNK_ROWS rows each."""
+    if pacsv is None or not use_arrow:
+        yield from pd.read_csv(csv_path, dtype=str, usecols=columns,
+                               chunksize=CHUNK_ROWS)
+        return
+
+    # Multithreaded Arrow parsing; every column stays a string, with
+    # read_csv's default NA markers parsed as null
+    reader = pacsv.open_csv(
+        csv_path,
+        read_options=pacsv.ReadOptions(use_threads=True, block_size=1 << 20),
+        convert_options=pacsv.ConvertOptions(
+            include_columns=columns,
+            column_types={c: pa.string() for c in columns},
+            null_values=NA_VALUES,
+            strings_can_be_null=True,
+        ),
+    )
+    batches = []
+    rows = 0
+    for batch in reader:
+        batches.append(batch)
+        rows += batch.num_rows
+        if rows >= CHUNK_ROWS:
+            yield pa.Table.from_batches(batches).to_pandas()
+            batches, rows = [], 0
+    if batches:
+        yield pa.Table.from_batches(batches).to_pandas()
+
+
+def stream_unique_rows(csv_path: str, column_sets: list) -> tuple:
+    """Read the CSV in chunks, keeping only the distinct rows of each column set.
+
+    Returns (input row count, distinct rows as raw text per column set).
+    """
+    needed = list(dict.fromkeys(c for columns in column_sets for c in columns))
+    if not needed:
+        # Nothing to extract; the first column still gives the row count
+        needed = list(pd.read_csv(csv_path, nrows=0).columns[:1])
+    if pacsv is not None:
+        try:
+            return collect_unique_rows(text_chunks(csv_path, needed), column_sets)
+        except pa.ArrowInvalid:
+            # Arrow rejects ragged rows, which read_csv pads with NaN
+            pass
+    return collect_unique_rows(text_chunks(csv_path, needed, use_arrow=False),
+                               column_sets)
+
+
+def collect_unique_rows(chunks, column_sets: list) -> tuple:
+    """Distinct rows of each column set over text chunks, with the total row count."""
+    # Per column set: distinct rows merged so far, plus chunk-distinct rows
+    # not yet merged into them
+    uniques = [None] * len(column_sets)
+    pending = [[] for _ in column_sets]
+    pending_rows = [0] * len(column_sets)
+    n_rows = 0
+
+    def merge(i):
+        parts = pending[i] if uniques[i] is None else [uniques[i]] + pending[i]
+        uniques[i] = pd.concat(parts).drop_duplicates()
+        pending[i], pending_rows[i] = [], 0
+
+    # Text chunks can't disagree on dtypes; memory stays at one chunk plus
+    # about twice the distinct rows seen so far
+    for chunk in chunks:
+        n_rows += len(chunk)
+        # One dedup over all needed columns; each table then projects the
+        # reduced rows (first occurrences, hence row order, are unchanged)
+        if len(column_sets) > 1:
+            chunk = chunk.drop_duplicates()
+        for i, columns in enumerate(column_sets):
+            rows = chunk[columns].drop_duplicates()
+            pending[i].append(rows)
+            pending_rows[i] += len(rows)
+            # Merging only once pending rows outgrow the merged ones keeps
+            # mostly-distinct tables from re-hashing every row per chunk
+            merged_rows = 0 if uniques[i] is None else len(uniques[i])
+            if pending_rows[i] > max(merged_rows, CHUNK_ROWS):
+                merge(i)
+
+    for i, columns in enumerate(column_sets):
+        if pending[i]:
+            merge(i)
+        elif uniques[i] is None:
+            # Header-only input yields no chunks at all
+            uniques[i] = pd.DataFrame(columns=columns, dtype=str)
+
+    return n_rows, uniques
+
+
+def extract_table(text_rows: pd.DataFrame, pk: list,
+                  table_path: Optional[Path] = None) -> pd.DataFrame:
+    """Build one output table from its distinct raw rows, writing it if a path is given."""
+    # Type the distinct rows as a full read would (each column keeps its
+    # full set of values), then deduplicate values equal after parsing
+    table_df = infer_dtypes(text_rows).drop_duplicates()
+
+    # Sort by primary key for consistency
+    table_df = table_df.sort_values(by=pk).reset_index(drop=True)
+
+    # Write to CSV
+    if table_path is not None:
+        write_table(table_df, table_path)
+    return table_df
+
+
+def write_table(df: pd.DataFrame, path: Path) -> None:
+    """Write a table as CSV, with Arrow's writer when its output is identical."""
+    # Arrow formats floats, bools and single-column null rows differently
+    # from to_csv and always quotes header names; ints and unquoted strings
+    # come out byte for byte the same
+    if pacsv is not None and all(
+            pd.api.types.is_integer_dtype(df[col])
+            or pd.api.types.infer_dtype(df[col], skipna=True) in ("string", "empty")
+            for col in df.columns) and not (df.shape[1] == 1 and df.isna().any().any()):
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        try:
+            with open(path, "wb") as f:
+                f.write(df.iloc[:0].to_csv(index=False).encode())
+                # Values that need quoting raise, and to_csv takes over
+                pacsv.write_csv(table, f, write_options=pacsv.WriteOptions(
+                    include_header=False, quoting_style="none"))
+            return
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            pass
+    df.to_csv(path, index=False)
+
+
 def transform(csv_path: str, config_path: str, output_dir: str,
               strict: bool = False) -> dict:
     """Apply transformation to new CSV data."""
-    df = pd.read_csv(csv_path)
+    header = pd.read_csv(csv_path, nrows=0)
     config = load_config(config_path)
 
+    # Only tables whose columns are all present get extracted
+    available = [t for t in config["tables"]
+                 if set(t["columns"]).issubset(header.columns)]
+    n_rows, uniques = stream_unique_rows(csv_path, [t["columns"] for t in available])
+
     print(f"Transforming {csv_path}...")
-    print(f"  Input rows: {len(df)}")
+    print(f"  Input rows: {n_rows}")
 
     # Validate structure
-    errors = validate_input(df, config)
+    errors = validate_input(header, config)
     if errors:
         for err in errors:
             print(f"  Warning: {err}")
@@ -74,42 +227,49 @@ def transform(csv_path: str, config_path: str, output_dir: str,
     tables_path.mkdir(exist_ok=True)
 
     results = {"tables": []}
-
-    # Transform each table
-    for table_config in config["tables"]:
-        name = table_config["name"]
-        columns = table_config["columns"]
-        pk = table_config["primary_key"]
-
-        # Check all columns exist
-        available_cols = [c for c in columns if c in df.columns]
-        if len(available_cols) != len(columns):
-            missing = set(columns) - set(available_cols)
-            print(f"  Skipping {name}: missing columns {missing}")
-            continue
-
-        # Extract and deduplicate
-        table_df = df[columns].drop_duplicates()
-
-        # Sort by primary key for consistency
-        table_df = table_df.sort_values(by=pk).reset_index(drop=True)
-
-        # Write to CSV
-        table_path = tables_path / f"{name}.csv"
-        table_df.to_csv(table_path, index=False)
-
-        results["tables"].append({
-            "name": name,
-            "rows": len(table_df),
-            "path": str(table_path)
-        })
-
-        print(f"  Created {name}.csv ({len(table_df)} rows)")
+    tables_by_name = {}
+
+    # Tables are independent, so type, dedup, sort and write them
+    # concurrently and report in config order. Tables sharing a name only
+    # write the last one, as sequential writes would.
+    last_for_name = {t["name"]: i for i, t in enumerate(available)}
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        extracted = iter([
+            executor.submit(
+                extract_table, rows, t["primary_key"],
+                tables_path / f"{t['name']}.csv" if last_for_name[t["name"]] == i else None)
+            for i, (t, rows) in enumerate(zip(available, uniques))
+        ])
+
+        # Transform each table
+        for table_config in config["tables"]:
+            name = table_config["name"]
+            columns = table_config["columns"]
+
+            # Check all columns exist
+            available_cols = [c for c in columns if c in header.columns]
+            if len(available_cols) != len(columns):
+                missing = set(columns) - set(available_cols)
+                print(f"  Skipping {name}: missing columns {missing}")
+                continue
+
+            table_df = next(extracted).result()
+            table_path = tables_path / f"{name}.csv"
+            tables_by_name[name] = table_df
+
+            results["tables"].append({
+                "name": name,
+                "rows": len(table_df),
+                "path": str(table_path)
+            })
+
+            print(f"  Created {name}.csv ({len(table_df)} rows)")
 
     # Validate foreign keys if present
     if "foreign_keys" in config:
         print("\n  Validating foreign keys...")
-        fk_errors = validate_foreign_keys(tables_path, config["foreign_keys"])
+        # Check the tables just extracted rather than re-reading them
+        fk_errors = validate_foreign_keys(tables_by_name, config["foreign_keys"])
         if fk_errors:
             for err in fk_errors:
                 print(f"    Warning: {err}")
@@ -121,27 +281,69 @@ def transform(csv_path: str, config_path: str, output_dir: str,
     return results
 
 
-def validate_foreign_keys(tables_path: Path, foreign_keys: list) -> list:
-    """Validate foreign key constraints."""
+def arrow_column(series: pd.Series):
+    """Series as an Arrow array, or None if its values don't share a type."""
+    try:
+        return pa.array(series, from_pandas=True)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        return None
+
+
+def count_orphans(child, parent) -> Optional[int]:
+    """Distinct non-null child values missing from parent (None if types can't be compared)."""
+    # parent may already be reduced to its unique non-null values
+    if child.type != parent.type:
+        numeric = (pa.types.is_integer, pa.types.is_floating)
+        if pa.types.is_null(parent.type):
+            parent = parent.cast(child.type)
+        elif pa.types.is_null(child.type):
+            return 0
+        elif any(f(child.type) for f in numeric) and any(f(parent.type) for f in numeric):
+            child, parent = child.cast(pa.float64()), parent.cast(pa.float64())
+        else:
+            return None
+
+    values = pc.unique(pc.drop_null(child))
+    if len(values) == 0:
+        return 0
+    found = pc.is_in(values, value_set=pc.unique(pc.drop_null(parent)))
+    return len(values) - pc.sum(found).as_py()
+
+
+def validate_foreign_keys(tables: dict, foreign_keys: list) -> list:
+    """Validate foreign key constraints against the extracted tables."""
     errors = []
 
-    for fk in foreign_keys:
-        child_path = tables_path / f"{fk['child_table']}.csv"
-        parent_path = tables_path / f"{fk['parent_table']}.csv"
+    # Several FKs often reference the same parent key; hash it once
+    parent_keys = {}
 
-        if not child_path.exists() or not parent_path.exists():
+    for fk in foreign_keys:
+        if fk["child_table"] not in tables or fk["parent_table"] not in tables:
             continue
 
-        child_df = pd.read_csv(child_path)
-        parent_df = pd.read_csv(parent_path)
-
-        child_values = set(child_df[fk["column"]].dropna())
-        parent_values = set(parent_df[fk["parent_column"]].dropna())
+        child_col = tables[fk["child_table"]][fk["column"]]
+        parent_col = tables[fk["parent_table"]][fk["parent_column"]]
+
+        # Arrow's is_in kernel on the two key columns when available
+        orphans = None
+        if pacsv is not None:
+            parent_key = (fk["parent_table"], fk["parent_column"])
+            if parent_key not in parent_keys:
+                parent = arrow_column(parent_col)
+                parent_keys[parent_key] = (None if parent is None
+                                           else pc.unique(pc.drop_null(parent)))
+            child = arrow_column(child_col)
+            if child is not None and parent_keys[parent_key] is not None:
+                orphans = count_orphans(child, parent_keys[parent_key])
+
+        if orphans is None:
+            # Hash join in pandas, over the distinct child values
+            child_values = pd.Series(child_col.dropna().unique())
+            orphans = int((~child_values.isin(parent_col.dropna())).sum())
 
-        orphans = child_values - parent_values
         if orphans:
             errors.append(
-                f"{fk['child_table']}.{fk['column']} has {len(orphans)} "
+                f"{fk['child_table']}.{fk['column']} has {orphans} "
                 f"orphan values not in {fk['parent_table']}"
             )
 
@@ -0,0 +1,48 @@
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+from transform import transform
+
+CONFIG = {
+    "version": "1.0",
+    "original_columns": ["a", "b", "c", "d"],
+    "tables": [
+        {"name": "t1", "columns": ["a", "b"], "primary_key": ["a"]},
+        {"name": "t2", "columns": ["c", "d"], "primary_key": ["c"]},
+    ],
+    "foreign_keys": [],
+}
+
+
+def run_transform(tmp_path, csv_text):
+    csv_path = tmp_path / "input.csv"
+    csv_path.write_text(csv_text)
+    config_path = tmp_path / "config.json"
+    config_path.write_text(json.dumps(CONFIG))
+    out = tmp_path / "out"
+    transform(str(csv_path), str(config_path), str(out))
+    return {t["name"]: (out / "tables" / f"{t['name']}.csv").read_text()
+            for t in CONFIG["tables"]}
+
+
+def test_ragged_row_is_padded_with_nulls(tmp_path):
+    tables = run_transform(tmp_path, "a,b,c,d\n1,x,2,y\n3,z,4\n5,w,6,v\n")
+
+    assert tables["t1"] == "a,b\n1,x\n3,z\n5,w\n"
+    assert tables["t2"] == "c,d\n2,y\n4,\n6,v\n"
+
+
+def test_header_only_input_writes_empty_tables(tmp_path):
+    tables = run_transform(tmp_path, "a,b,c,d\n")
+
+    assert tables == {"t1": "a,b\n", "t2": "c,d\n"}
+
+
+def test_quoted_newlines_and_quotes_round_trip(tmp_path):
+    tables = run_transform(tmp_path, 'a,b,c,d\n1,"line1\nline2",2,y\n3,z,4,"q,""r"""\n')
+
+    assert tables["t1"] == 'a,b\n1,"line1\nline2"\n3,z\n'
+    assert tables["t2"] == 'c,d\n2,y\n4,"q,""r"""\n'
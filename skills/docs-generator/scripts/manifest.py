@@ -7,15 +7,39 @@ Enables incremental documentation updates by detecting changes.
 import argparse
 import hashlib
 import json
+import mmap
 import os
 import subprocess
 import sys
-from datetime import datetime
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import Optional, Dict, Any, List
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import xxhash
+    HASH_ALGO = "xxh3"
+except ImportError:
+    xxhash = None
+    HASH_ALGO = "sha256"
+
 MANIFEST_FILE = ".docs-manifest.json"
 
+# Digests computed earlier in a session, keyed by "algo:path" and tagged
+# with the size and mtime they were taken at (see --hash-cache)
+hash_cache: Optional[Dict[str, list]] = None
+
+
+def utc_now() -> str:
+    """Current UTC time as an ISO string ending in Z."""
+    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+
 
 def get_manifest_path(project_root: str) -> Path:
     """Get path to manifest file in docs directory."""
@@ -26,6 +50,8 @@ def load_manifest(project_root: str) -> Optional[Dict[str, Any]]:
     """Load existing manifest file if it exists."""
     path = get_manifest_path(project_root)
     if path.exists():
+        if orjson is not None:
+            return orjson.loads(path.read_bytes())
         with open(path, "r") as f:
             return json.load(f)
     return None
@@ -35,36 +61,112 @@ def save_manifest(project_root: str, manifest: dict) -> None:
     """Save manifest to file."""
     path = get_manifest_path(project_root)
     path.parent.mkdir(parents=True, exist_ok=True)
-    manifest["last_updated"] = datetime.utcnow().isoformat() + "Z"
-    with open(path, "w") as f:
-        json.dump(manifest, f, indent=2)
+    manifest["last_updated"] = utc_now()
+    # Write a temp file and rename it over the manifest, so an interrupted
+    # save never leaves a truncated manifest behind
+    tmp_path = path.with_suffix(".tmp")
+    if orjson is not None:
+        tmp_path.write_bytes(orjson.dumps(manifest, option=orjson.OPT_INDENT_2))
+    else:
+        with open(tmp_path, "w") as f:
+            json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, path)
     print(f"Manifest saved to {path}")
 
 
 def init_manifest() -> dict:
     """Create new manifest structure."""
+    now = utc_now()
     return {
         "version": "1.0",
-        "created_at": datetime.utcnow().isoformat() + "Z",
-        "last_updated": datetime.utcnow().isoformat() + "Z",
+        "created_at": now,
+        "last_updated": now,
         "source_files": {},
         "doc_files": {}
     }
 
 
-def file_hash(filepath: Path) -> str:
-    """Calculate SHA256 hash of file contents."""
-    sha256 = hashlib.sha256()
+def file_hash(filepath: Path, algo: str = HASH_ALGO) -> str:
+    """Calculate an algorithm-tagged hash of file contents, e.g. "xxh3:<hex>"."""
+    if hash_cache is not None:
+        st = os.stat(filepath)
+        key = f"{algo}:{os.path.abspath(filepath)}"
+        cached = hash_cache.get(key)
+        if cached and cached[:2] == [st.st_size, st.st_mtime_ns]:
+            return cached[2]
+        result = compute_hash(filepath, algo)
+        hash_cache[key] = [st.st_size, st.st_mtime_ns, result]
+        return result
+    return compute_hash(filepath, algo)
+
+
+def compute_hash(filepath: Path, algo: str) -> str:
+    """Hash file contents with the given algorithm."""
+    digest = xxhash.xxh3_64 if algo == "xxh3" else hashlib.sha256
     with open(filepath, "rb") as f:
-        for chunk in iter(lambda: f.read(8192), b""):
-            sha256.update(chunk)
-    return sha256.hexdigest()
+        if hasattr(hashlib, "file_digest"):
+            # Python 3.11+: C-level read/update loop over large buffers
+            hasher = hashlib.file_digest(f, digest)
+        else:
+            hasher = digest()
+            # mmap can't map empty files
+            if os.fstat(f.fileno()).st_size:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    hasher.update(mm)
+    return f"{algo}:{hasher.hexdigest()}"
+
+
+def load_hash_cache(path: str) -> None:
+    """Load the session hash cache from a file, if it exists."""
+    global hash_cache
+    cache_path = Path(path)
+    if not cache_path.exists():
+        hash_cache = {}
+    elif orjson is not None:
+        hash_cache = orjson.loads(cache_path.read_bytes())
+    else:
+        with open(cache_path, "r") as f:
+            hash_cache = json.load(f)
+
+
+def save_hash_cache(path: str) -> None:
+    """Write the session hash cache back to its file."""
+    if orjson is not None:
+        Path(path).write_bytes(orjson.dumps(hash_cache))
+    else:
+        with open(path, "w") as f:
+            json.dump(hash_cache, f)
+
+
+def hash_matches(filepath: Path, stored: Optional[str]) -> bool:
+    """Check file contents against a stored hash, in whichever algorithm it used."""
+    if not stored:
+        return False
+    # Untagged hashes come from manifests written before the algo prefix
+    algo, _, digest = stored.rpartition(":")
+    algo = algo or "sha256"
+    if algo == "xxh3" and xxhash is None:
+        return False
+    return file_hash(filepath, algo) == f"{algo}:{digest}"
 
 
 def file_mtime(filepath: Path) -> str:
     """Get file modification time as ISO string."""
     mtime = os.path.getmtime(filepath)
-    return datetime.utcfromtimestamp(mtime).isoformat() + "Z"
+    return datetime.fromtimestamp(mtime, timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def file_status(full_path: Path, info: dict) -> str:
+    """Classify a tracked file as "removed", "modified" or "unchanged"."""
+    if not full_path.exists():
+        return "removed"
+    # Same size and mtime as when tracked: unchanged without hashing
+    st = full_path.stat()
+    same_stat = (st.st_size == info.get("size")
+                 and st.st_mtime_ns == info.get("mtime_ns"))
+    if not same_stat and not hash_matches(full_path, info.get("hash")):
+        return "modified"
+    return "unchanged"
 
 
 def git_available(project_root: str) -> bool:
@@ -83,30 +185,26 @@ def git_available(project_root: str) -> bool:
 
 def git_changed_files(project_root: str, since_hash: str = None) -> List[str]:
     """Get list of changed files using git."""
+    # NUL-separated output: paths arrive verbatim, without quoting of
+    # spaces or special characters. All paths are relative to project_root,
+    # like the manifest's keys, even when it is a subdirectory of the repo
     try:
         if since_hash:
             result = subprocess.run(
-                ["git", "diff", "--name-only", since_hash],
-                cwd=project_root,
-                capture_output=True,
-                text=True
-            )
-        else:
-            result = subprocess.run(
-                ["git", "status", "--porcelain"],
+                ["git", "diff", "--name-only", "--relative", "-z", since_hash],
                 cwd=project_root,
-                capture_output=True,
-                text=True
+                capture_output=True
             )
-            # Parse porcelain output
-            files = []
-            for line in result.stdout.strip().split("\n"):
-                if line:
-                    # Format is "XY filename" where XY is status
-                    files.append(line[3:])
-            return files
-
-        return result.stdout.strip().split("\n") if result.stdout.strip() else []
+            return [os.fsdecode(p) for p in result.stdout.split(b"\0") if p]
+
+        # Plumbing instead of git status: unstaged changes and untracked
+        # files from ls-files, plus staged changes from the index
+        files = []
+        for cmd in (["git", "ls-files", "-m", "-o", "--exclude-standard", "-z"],
+                    ["git", "diff", "--cached", "--name-only", "--relative", "-z"]):
+            result = subprocess.run(cmd, cwd=project_root, capture_output=True)
+            files.extend(os.fsdecode(p) for p in result.stdout.split(b"\0") if p)
+        return list(dict.fromkeys(files))
     except Exception:
         return []
 
@@ -132,7 +230,7 @@ def cmd_check(args) -> None:
         "modified": [],
         "removed": [],
         "unchanged": [],
-        "doc_mapping": {}
+        "doc_mapping": defaultdict(list)
     }
 
     # Check if git is available for smarter detection
@@ -142,28 +240,20 @@ def cmd_check(args) -> None:
         print("Using git for change detection...")
         git_changes = git_changed_files(args.project_root)
 
-    # Check each tracked file
-    for filepath, info in source_files.items():
-        full_path = project_root / filepath
+    # Check each tracked file; hashing releases the GIL, so threads overlap
+    # both disk reads and hashing
+    def check_file(item):
+        filepath, info = item
+        return file_status(project_root / filepath, info)
 
-        if not full_path.exists():
-            changes["removed"].append(filepath)
-            if info.get("docs"):
-                for doc in info["docs"]:
-                    if doc not in changes["doc_mapping"]:
-                        changes["doc_mapping"][doc] = []
-                    changes["doc_mapping"][doc].append(filepath)
-        else:
-            current_hash = file_hash(full_path)
-            if current_hash != info.get("hash"):
-                changes["modified"].append(filepath)
-                if info.get("docs"):
-                    for doc in info["docs"]:
-                        if doc not in changes["doc_mapping"]:
-                            changes["doc_mapping"][doc] = []
-                        changes["doc_mapping"][doc].append(filepath)
-            else:
-                changes["unchanged"].append(filepath)
+    with ThreadPoolExecutor(max_workers=(os.cpu_count() or 1) * 2) as executor:
+        statuses = list(executor.map(check_file, source_files.items()))
+
+    for (filepath, info), status in zip(source_files.items(), statuses):
+        changes[status].append(filepath)
+        if status != "unchanged":
+            for doc in info.get("docs") or ():
+                changes["doc_mapping"][doc].append(filepath)
 
     # Check for new files (if using git)
     if use_git:
@@ -192,6 +282,35 @@ def cmd_check(args) -> None:
                 print(f"    - {src}")
 
 
+def update_entries(manifest: dict, project_root: Path, files: List[str],
+                   docs: List[str]) -> None:
+    """Track source files and the docs generated from them in the manifest."""
+    # Update source files
+    for filepath in files:
+        full_path = project_root / filepath
+        if full_path.exists():
+            st = full_path.stat()
+            manifest["source_files"][filepath] = {
+                "hash": file_hash(full_path),
+                "mtime": file_mtime(full_path),
+                "size": st.st_size,
+                "mtime_ns": st.st_mtime_ns,
+                "docs": docs
+            }
+            print(f"Tracked: {filepath}")
+
+    # Update doc files
+    generated_at = utc_now()
+    for doc in docs:
+        doc_path = project_root / doc
+        manifest["doc_files"][doc] = {
+            "generated_at": generated_at,
+            "sources": files,
+            "exists": doc_path.exists()
+        }
+        print(f"Documented: {doc}")
+
+
 def cmd_update(args) -> None:
     """Update manifest after documentation generation."""
     manifest = load_manifest(args.project_root)
@@ -213,26 +332,26 @@ def cmd_update(args) -> None:
     else:
         docs = []
 
-    # Update source files
-    for filepath in files:
-        full_path = project_root / filepath
-        if full_path.exists():
-            manifest["source_files"][filepath] = {
-                "hash": file_hash(full_path),
-                "mtime": file_mtime(full_path),
-                "docs": docs
-            }
-            print(f"Tracked: {filepath}")
+    update_entries(manifest, project_root, files, docs)
+    save_manifest(args.project_root, manifest)
 
-    # Update doc files
-    for doc in docs:
-        doc_path = project_root / doc
-        manifest["doc_files"][doc] = {
-            "generated_at": datetime.utcnow().isoformat() + "Z",
-            "sources": files,
-            "exists": doc_path.exists()
-        }
-        print(f"Documented: {doc}")
+
+def cmd_update_batch(args) -> None:
+    """Apply many file/doc updates with a single manifest write."""
+    manifest = load_manifest(args.project_root)
+
+    if not manifest:
+        manifest = init_manifest()
+
+    project_root = Path(args.project_root)
+
+    # Batch file: [{"files": [...], "docs": [...]}, ...]
+    with open(args.batch_file, "r") as f:
+        batch = json.load(f)
+
+    for entry in batch:
+        update_entries(manifest, project_root, entry.get("files", []),
+                       entry.get("docs", []))
 
     save_manifest(args.project_root, manifest)
 
@@ -272,6 +391,7 @@ def main():
     check_parser = subparsers.add_parser("check", help="Check for changes")
     check_parser.add_argument("project_root", help="Project root directory")
     check_parser.add_argument("--no-git", action="store_true", help="Don't use git for detection")
+    check_parser.add_argument("--hash-cache", help="File caching hashes between commands of a session")
     check_parser.set_defaults(func=cmd_check)
 
     # Update command
@@ -279,8 +399,16 @@ def main():
     update_parser.add_argument("project_root", help="Project root directory")
     update_parser.add_argument("--files", help="Comma-separated source files")
     update_parser.add_argument("--docs", help="Comma-separated doc files")
+    update_parser.add_argument("--hash-cache", help="File caching hashes between commands of a session")
     update_parser.set_defaults(func=cmd_update)
 
+    # Batch update command
+    batch_parser = subparsers.add_parser("update-batch", help="Update manifest from a batch file")
+    batch_parser.add_argument("project_root", help="Project root directory")
+    batch_parser.add_argument("batch_file", help='JSON list of {"files": [...], "docs": [...]} entries')
+    batch_parser.add_argument("--hash-cache", help="File caching hashes between commands of a session")
+    batch_parser.set_defaults(func=cmd_update_batch)
+
     # Init command
     init_parser = subparsers.add_parser("init", help="Initialize manifest")
     init_parser.add_argument("project_root", help="Project root directory")
@@ -298,7 +426,12 @@ def main():
         parser.print_help()
         sys.exit(1)
 
-    args.func(args)
+    if getattr(args, "hash_cache", None):
+        load_hash_cache(args.hash_cache)
+        args.func(args)
+        save_hash_cache(args.hash_cache)
+    else:
+        args.func(args)
 
 
 if __name__ == "__main__":
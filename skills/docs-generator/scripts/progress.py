@@ -8,13 +8,23 @@ import argparse
 import json
 import os
 import sys
-from datetime import datetime
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import Optional, Dict, Any
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 PROGRESS_FILE = ".progress.json"
 
 
+def utc_now() -> str:
+    """Current UTC time as an ISO string ending in Z."""
+    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
 def get_progress_path(project_root: str) -> Path:
     """Get path to progress file in docs directory."""
     return Path(project_root) / "docs" / PROGRESS_FILE
@@ -24,6 +34,8 @@ def load_progress(project_root: str) -> Optional[Dict[str, Any]]:
     """Load existing progress file if it exists."""
     path = get_progress_path(project_root)
     if path.exists():
+        if orjson is not None:
+            return orjson.loads(path.read_bytes())
         with open(path, "r") as f:
             return json.load(f)
     return None
@@ -33,19 +45,23 @@ def save_progress(project_root: str, progress: dict) -> None:
     """Save progress to file."""
     path = get_progress_path(project_root)
     path.parent.mkdir(parents=True, exist_ok=True)
-    progress["last_updated"] = datetime.utcnow().isoformat() + "Z"
-    with open(path, "w") as f:
-        json.dump(progress, f, indent=2)
+    progress["last_updated"] = utc_now()
+    if orjson is not None:
+        path.write_bytes(orjson.dumps(progress, option=orjson.OPT_INDENT_2))
+    else:
+        with open(path, "w") as f:
+            json.dump(progress, f, indent=2)
     print(f"Progress saved to {path}")
 
 
 def init_progress(language: str = "en") -> dict:
     """Create new progress structure."""
+    now = utc_now()
     return {
         "version": "1.0",
         "language": language,
-        "started_at": datetime.utcnow().isoformat() + "Z",
-        "last_updated": datetime.utcnow().isoformat() + "Z",
+        "started_at": now,
+        "last_updated": now,
         "phase": "init",
         "analysis": {},
         "scope": {
@@ -147,7 +163,7 @@ def cmd_save(args) -> None:
         status = args.status or "pending"
         progress["docs"][args.doc] = {
             "status": status,
-            "updated_at": datetime.utcnow().isoformat() + "Z"
+            "updated_at": utc_now()
         }
 
     # Update scope if provided
@@ -170,7 +186,7 @@ def cmd_complete(args) -> None:
 
     progress["docs"][args.doc] = {
         "status": "completed",
-        "completed_at": datetime.utcnow().isoformat() + "Z"
+        "completed_at": utc_now()
     }
 
     save_progress(args.project_root, progress)
@@ -0,0 +1,61 @@
+import hashlib
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+from manifest import file_hash, file_status, hash_matches
+
+
+def tracked_info(path, **overrides):
+    st = path.stat()
+    info = {"hash": file_hash(path), "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+    info.update(overrides)
+    return info
+
+
+def test_untagged_hash_is_read_as_sha256(tmp_path):
+    path = tmp_path / "src.py"
+    path.write_bytes(b"print('hi')\n")
+    legacy = hashlib.sha256(b"print('hi')\n").hexdigest()
+
+    assert hash_matches(path, legacy)
+    assert hash_matches(path, f"sha256:{legacy}")
+    assert not hash_matches(path, hashlib.sha256(b"other").hexdigest())
+    assert not hash_matches(path, "")
+
+
+def test_matching_size_and_mtime_skip_hashing(tmp_path):
+    path = tmp_path / "src.py"
+    path.write_text("a = 1\n")
+
+    # A stale hash is never checked while size and mtime still match
+    assert file_status(path, tracked_info(path, hash="sha256:stale")) == "unchanged"
+
+
+def test_changed_metadata_falls_back_to_hash(tmp_path):
+    path = tmp_path / "src.py"
+    path.write_text("a = 1\n")
+    info = tracked_info(path)
+
+    # Touched but identical contents
+    os.utime(path, ns=(info["mtime_ns"] + 10**9,) * 2)
+    assert file_status(path, info) == "unchanged"
+
+    path.write_text("a = 2\n")
+    assert file_status(path, info) == "modified"
+
+
+def test_entries_without_stat_fields_compare_hash(tmp_path):
+    path = tmp_path / "src.py"
+    path.write_text("a = 1\n")
+    legacy = {"hash": hashlib.sha256(b"a = 1\n").hexdigest()}
+
+    assert file_status(path, legacy) == "unchanged"
+    path.write_text("a = 2\n")
+    assert file_status(path, legacy) == "modified"
+
+
+def test_missing_file_is_removed(tmp_path):
+    assert file_status(tmp_path / "gone.py", {"hash": "sha256:x"}) == "removed"